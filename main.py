@@ -1,20 +1,352 @@
 import streamlit as st
 import pandas as pd
 import openai
+import asyncio
+import csv
+import json
+import os
 import re
+import shutil
+import tempfile
 import time
-from io import StringIO
+import uuid
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO, TextIOWrapper
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException
 from webdriver_manager.chrome import ChromeDriverManager
 import logging
+from dataclasses import dataclass
 from datetime import datetime
 
+# Email pattern, compiled once: EMAIL_RE for text, EMAIL_BYTES_RE for raw upload bytes
+EMAIL_PATTERN = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+EMAIL_BYTES_RE = re.compile(EMAIL_PATTERN.encode())
+
+# Uploads are scanned in chunks of this many bytes; only this many rows are parsed for the preview
+CHUNK_SIZE = 1 << 20
+PREVIEW_ROWS = 10
+
+# Bytes (and characters) that can appear in an EMAIL_PATTERN match, and the longest valid address (RFC 5321)
+EMAIL_CHAR_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-@')
+EMAIL_CHARS = frozenset(map(chr, EMAIL_CHAR_BYTES))
+MAX_EMAIL_LEN = 254
+
+# OpenAI extraction: characters of CSV per request (keeps prompts under the token limit)
+# and how many requests may be in flight at once
+AI_CHUNK_CHARS = 3800
+AI_MAX_CONCURRENCY = 8
+# Uploads kept per cached function; each entry holds a whole file's bytes as its key
+CACHE_MAX_ENTRIES = 16
+
+# Automation runs are logged to LOG_DIR/<timestamp>_<id>.jsonl next to this script, or to
+# LOG_FALLBACK_DIR when that isn't writable; session state only keeps the path, so it doesn't
+# grow with the run. Only the newest LOG_KEEP run logs are kept in either directory.
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+LOG_FALLBACK_DIR = os.path.join(tempfile.gettempdir(), "maven-email-automation-logs")
+LOG_KEEP = 50
+
+# Persistent Chrome profiles (one per parallel browser) and start attempts before a worker gives up
+PROFILE_SLOTS = 8
+BROWSER_START_ATTEMPTS = 3
+
+# Default element selectors, tried in order.
+# Target-first: Target Session has placeholder="Your email", NO name. Right Now has name="email".
+# Never use input[name*="email"] or input[id*="email"] early—they match Right Now first.
+DEFAULT_EMAIL_SELECTORS = (
+    "//input[@type='email' and @placeholder='Your email']",   # Target Session
+    "//input[@placeholder='Your email' and @type='email']",
+    'input[type="email"][placeholder="Your email"]',
+    "//form[.//input[@placeholder='Your email']]//input[@type='email']",  # scoped by form
+    "//input[@type='email' and not(@name)]",   # fallback: Target has no name
+    "//input[@type='email']",                 # last resort
+)
+
+DEFAULT_SUBMIT_SELECTORS = (
+    "//button[@aria-label='submit' and .//p[normalize-space()='Sign up']]",  # Target Session
+    "//button[@aria-label='submit' and contains(., 'Sign up')]",
+    "//form[.//input[@placeholder='Your email']]//button[contains(., 'Sign up')]",  # scoped by form
+    "//button[contains(text(), 'Sign up')]",
+    "//button[@type='submit']",
+)
+
+# Returns [index, element] for the first [selector, kind] pair matching a visible element, or null
+FIND_FIRST_VISIBLE_JS = """
+const candidates = arguments[0];
+for (let i = 0; i < candidates.length; i++) {
+    const [selector, kind] = candidates[i];
+    let element = null;
+    try {
+        element = kind === 'xpath'
+            ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {
+        continue;  // invalid selector
+    }
+    if (!element) {
+        continue;
+    }
+    // Same rules as Selenium's is_displayed(): skip hidden, transparent or zero-size elements
+    const style = window.getComputedStyle(element);
+    const rect = element.getBoundingClientRect();
+    if (style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0'
+            && rect.width > 0 && rect.height > 0) {
+        return [i, element];
+    }
+}
+return null;
+"""
+
+@st.cache_resource(show_spinner=False)
+def chromedriver_path():
+    """Resolve (downloading if needed) the chromedriver binary once per server process"""
+    return ChromeDriverManager().install()
+
+class ProfilePool:
+    """Hands out Chrome profile directories so no two live browsers share one.
+
+    Chrome refuses a --user-data-dir that another browser holds, so persistent
+    slots are reserved here for the whole server process (every session and any
+    browsers still shutting down from an interrupted run). When every slot is
+    busy, a throwaway temporary profile is used instead.
+    """
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self._size = size
+        self._busy = set()
+        self._temporary = set()
+    
+    def slot_path(self, slot):
+        return os.path.join(tempfile.gettempdir(), f"mvn_email_agent_profile_{slot}")
+    
+    def acquire(self, preferred_slot=0, persistent=True):
+        """Reserve a profile directory, preferring the given persistent slot"""
+        with self._lock:
+            if persistent:
+                for slot in (preferred_slot, *range(self._size)):
+                    path = self.slot_path(slot)
+                    if slot < self._size and path not in self._busy:
+                        self._busy.add(path)
+                        return path
+            path = tempfile.mkdtemp(prefix="mvn_email_agent_tmp_profile_")
+            self._busy.add(path)
+            self._temporary.add(path)
+            return path
+    
+    def release(self, path):
+        """Give a profile back; temporary ones are deleted"""
+        with self._lock:
+            self._busy.discard(path)
+            temporary = path in self._temporary
+            self._temporary.discard(path)
+        if temporary:
+            shutil.rmtree(path, ignore_errors=True)
+
+@st.cache_resource(show_spinner=False)
+def profile_pool():
+    """The process-wide ProfilePool shared by every Streamlit session"""
+    return ProfilePool(PROFILE_SLOTS)
+
+def prune_logs(log_dir, keep):
+    """Delete all but the newest keep run logs in log_dir (names sort by start time)"""
+    names = sorted(name for name in os.listdir(log_dir) if name.endswith('.jsonl'))
+    for name in names[:max(len(names) - keep, 0)]:
+        try:
+            os.remove(os.path.join(log_dir, name))
+        except OSError:
+            pass  # Already gone, e.g. pruned by another session
+
+def open_run_log():
+    """Create a new JSONL run log, trying LOG_DIR then LOG_FALLBACK_DIR.
+
+    Returns (file, path), or (None, None) when neither directory is writable.
+    """
+    name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl"
+    for log_dir in (LOG_DIR, LOG_FALLBACK_DIR):
+        log_path = os.path.join(log_dir, name)
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            prune_logs(log_dir, LOG_KEEP - 1)
+            return open(log_path, 'a', encoding='utf-8'), log_path
+        except OSError:
+            continue
+    return None, None
+
+def scan_emails(file, chunk_size=CHUNK_SIZE):
+    """Regex-scan a binary file for emails in fixed-size chunks, keeping memory at O(chunk).
+
+    Each scan stops after the last byte that cannot be part of an email, and only the
+    trailing run of email characters (at most MAX_EMAIL_LEN bytes) carries over, so no
+    email is split across two scans and the carried tail stays bounded.
+    """
+    found = set()
+    tail = b''
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            break
+        buf = tail + data
+        cut = len(buf)
+        limit = max(cut - MAX_EMAIL_LEN, 0)
+        while cut > limit and buf[cut - 1] in EMAIL_CHAR_BYTES:
+            cut -= 1
+        found.update(EMAIL_BYTES_RE.findall(buf, 0, cut))
+        tail = buf[cut:]
+    found.update(EMAIL_BYTES_RE.findall(tail))
+    return {email.decode('utf-8', errors='ignore') for email in found}
+
+def count_csv_rows(file):
+    """Count data rows (excluding the header and blank lines) the way pandas would.
+
+    Streams the file through the csv module, so quoted multi-line fields count once
+    and CR-only line endings are understood. Returns None if the file isn't valid CSV.
+    """
+    reader = csv.reader(TextIOWrapper(file, encoding='utf-8', errors='replace', newline=''))
+    try:
+        rows = sum(1 for row in reader if row)
+    except csv.Error:
+        return None
+    return max(rows - 1, 0)
+
+def chunk_text(text, size=AI_CHUNK_CHARS):
+    """Split text into pieces of at most size characters, breaking on line boundaries where possible"""
+    chunks = []
+    current = ''
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > size:
+            chunks.append(current)
+            current = ''
+        # A single overlong line is cut into pieces of at most size characters, each cut
+        # backed up past any trailing email characters so no address spans two chunks
+        while len(line) > size:
+            cut = size
+            limit = max(cut - MAX_EMAIL_LEN, 0)
+            while cut > limit and line[cut - 1] in EMAIL_CHARS:
+                cut -= 1
+            if cut == limit:
+                cut = size  # The run is too long to be one address; cut it where it falls
+            chunks.append(line[:cut])
+            line = line[cut:]
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def extract_emails_with_openai(api_key, chunks):
+    """Ask OpenAI for the emails in each chunk concurrently.
+
+    Returns one entry per chunk: the reply text, or the exception that chunk raised,
+    so a single failed request (e.g. a 429) doesn't discard the others. Once the key
+    is rejected, the chunks not yet sent fail with that same error instead.
+    """
+    semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)  # Stay under the API rate limit
+    rejected = []  # AuthenticationError from the first chunk the key was refused on
+    
+    async with openai.AsyncOpenAI(api_key=api_key) as client:
+        async def extract_chunk(chunk):
+            # Use OpenAI to extract emails
+            prompt = f"""Analyze the following CSV data and extract all email addresses. 
+Return only the email addresses, one per line, without any additional text or explanation.
+If no emails are found, return "No emails found".
+
+CSV Data:
+{chunk}"""
+            
+            async with semaphore:
+                # A rejected key fails every request the same way, so stop sending chunks
+                if rejected:
+                    raise rejected[0]
+                try:
+                    response = await client.chat.completions.create(
+                        model="gpt-3.5-turbo",
+                        messages=[
+                            {"role": "system", "content": "You are an expert at extracting email addresses from text data. Return only email addresses, one per line."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.1,
+                        max_tokens=1000
+                    )
+                except openai.AuthenticationError as e:
+                    rejected.append(e)
+                    raise
+            return response.choices[0].message.content.strip()
+        
+        return await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+class PartialAIResult(Exception):
+    """Some OpenAI chunks failed; carries the emails parsed from the ones that succeeded.
+
+    Raised rather than returned so st.cache_data never stores an incomplete answer.
+    """
+    def __init__(self, emails, failed, total, first_error):
+        super().__init__(first_error)
+        self.emails = emails
+        self.failed = failed
+        self.total = total
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def scan_upload(file_bytes):
+    """Regex emails and source row count of raw CSV bytes; memoized on the file contents"""
+    # Stream the raw upload bytes through the regex; no DataFrame needed
+    return scan_emails(BytesIO(file_bytes)), count_csv_rows(BytesIO(file_bytes))
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def ai_scan_upload(file_bytes, api_key):
+    """Emails OpenAI finds in raw CSV bytes, one request per chunk of the file.
+
+    Memoized only when every chunk succeeded. Raises PartialAIResult when only some
+    did, and the OpenAI error itself when the key is rejected or no chunk succeeded.
+    """
+    # Every chunk goes to OpenAI concurrently, so the whole file is covered
+    csv_string = file_bytes.decode('utf-8', errors='ignore')
+    results = asyncio.run(extract_emails_with_openai(api_key, chunk_text(csv_string)))
+    replies = [result for result in results if isinstance(result, str)]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    
+    # A bad key or an outright failure goes to the caller's OpenAI error handlers
+    for error in errors:
+        if isinstance(error, openai.AuthenticationError):
+            raise error
+    if errors and not replies:
+        raise errors[0]
+    
+    # Parse the responses that succeeded
+    ai_emails = set(EMAIL_RE.findall("\n".join(replies)))
+    if errors:
+        raise PartialAIResult(ai_emails, len(errors), len(results), str(errors[0]))
+    return ai_emails
+
+def extract_emails(file_bytes, api_key=None):
+    """Extract unique emails from raw CSV bytes.
+
+    The regex scan always runs. When api_key is given, OpenAI is asked as well
+    and whatever it found is merged in.
+    Returns (sorted emails, source row count, ai_failure) where ai_failure is None
+    or (failed chunks, total chunks, first error message).
+    """
+    regex_emails, row_count = scan_upload(file_bytes)
+    
+    # st.cache_data hands back a fresh copy, so merging in place is safe
+    all_emails = regex_emails
+    ai_failure = None
+    if api_key:
+        try:
+            all_emails.update(ai_scan_upload(file_bytes, api_key))
+        except PartialAIResult as partial:
+            all_emails.update(partial.emails)
+            ai_failure = (partial.failed, partial.total, str(partial))
+    
+    # Sort once (every match already contains '@')
+    return sorted(all_emails), row_count, ai_failure
+
 # Page configuration
 st.set_page_config(
     page_title="Email Extractor & Automation Agent",
@@ -25,10 +357,12 @@ st.set_page_config(
 # Initialize session state
 if 'extracted_emails' not in st.session_state:
     st.session_state.extracted_emails = []
-if 'automation_logs' not in st.session_state:
-    st.session_state.automation_logs = []
+if 'automation_log_path' not in st.session_state:
+    st.session_state.automation_log_path = None
 if 'automation_running' not in st.session_state:
     st.session_state.automation_running = False
+if 'selector_cache' not in st.session_state:
+    st.session_state.selector_cache = {}  # (url, email_selectors, submit_selectors) -> (email_selector, submit_selector)
 
 st.title("📧 Email Extractor & Automation Agent")
 st.markdown("Upload a CSV file, extract emails, and automate form submissions")
@@ -39,13 +373,18 @@ with st.sidebar:
     api_key = st.text_input(
         "OpenAI API Key",
         type="password",
-        help="Enter your OpenAI API key to extract emails from the CSV file"
+        help="Only needed when OpenAI extraction is enabled below"
+    )
+    use_ai_extraction = st.checkbox(
+        "🤖 Also extract emails with OpenAI",
+        value=False,
+        help="Regex extraction runs over the whole file; OpenAI reads it in ~4000-character chunks, one billed request each"
     )
     
     st.markdown("---")
     st.markdown("### Instructions")
     st.markdown("""
-    1. Enter your OpenAI API key in the sidebar
+    1. (Optional) Enable OpenAI extraction and enter your API key
     2. Upload a CSV file
     3. Click 'Extract Emails' to process
     4. Download the results as CSV
@@ -61,69 +400,43 @@ uploaded_file = st.file_uploader(
 if uploaded_file is not None:
     # Read the CSV file
     try:
-        df = pd.read_csv(uploaded_file)
-        st.success(f"✅ File uploaded successfully! ({len(df)} rows)")
+        # Only the preview rows are parsed; extraction streams the raw bytes
+        df = pd.read_csv(uploaded_file, nrows=PREVIEW_ROWS)
+        st.success(f"✅ File uploaded successfully! ({uploaded_file.size / 1024:,.1f} KB)")
         
         # Display preview of the uploaded file
         with st.expander("📋 Preview of uploaded CSV", expanded=False):
-            st.dataframe(df.head(10))
+            st.dataframe(df)
         
         # Extract emails button
         if st.button("🔍 Extract Emails", type="primary"):
-            if not api_key:
+            if use_ai_extraction and not api_key:
                 st.error("❌ Please enter your OpenAI API key in the sidebar")
             else:
-                with st.spinner("🔄 Extracting emails using OpenAI API..."):
+                with st.spinner("🔄 Extracting emails..."):
                     try:
-                        # Set OpenAI API key
-                        openai.api_key = api_key
-                        client = openai.OpenAI(api_key=api_key)
-                        
-                        # Convert DataFrame to string for analysis
-                        csv_string = df.to_string()
-                        
-                        # Use OpenAI to extract emails
-                        prompt = f"""Analyze the following CSV data and extract all email addresses. 
-Return only the email addresses, one per line, without any additional text or explanation.
-If no emails are found, return "No emails found".
-
-CSV Data:
-{csv_string[:4000]}"""  # Limit to avoid token limits
-                        
-                        response = client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[
-                                {"role": "system", "content": "You are an expert at extracting email addresses from text data. Return only email addresses, one per line."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            temperature=0.1,
-                            max_tokens=1000
+                        # Cached on the file contents, so repeat clicks on the same upload are free
+                        # all_emails comes back deduplicated and sorted
+                        all_emails, row_count, ai_failure = extract_emails(
+                            uploaded_file.getvalue(), api_key if use_ai_extraction else None
                         )
-                        
-                        # Parse the response
-                        extracted_text = response.choices[0].message.content.strip()
-                        
-                        # Also use regex as a fallback to find emails in the CSV
-                        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                        regex_emails = set(re.findall(email_pattern, csv_string, re.IGNORECASE))
-                        
-                        # Combine OpenAI results with regex results
-                        ai_emails = [line.strip() for line in extracted_text.split('\n') 
-                                    if '@' in line and 'No emails found' not in line]
-                        
-                        # Combine and deduplicate
-                        all_emails = list(set(ai_emails + list(regex_emails)))
-                        all_emails = [email for email in all_emails if email and '@' in email]
+                        if ai_failure:
+                            failed_chunks, total_chunks, first_error = ai_failure
+                            st.warning(
+                                f"⚠️ OpenAI failed on {failed_chunks} of {total_chunks} chunk(s) ({first_error}). "
+                                "Showing regex results plus the chunks that succeeded; click Extract again to retry."
+                            )
+                        domains = {email.rsplit('@', 1)[1] for email in all_emails}
                         
                         if all_emails:
                             # Store emails in session state
-                            st.session_state.extracted_emails = sorted(all_emails)
+                            st.session_state.extracted_emails = all_emails
                             
                             st.success(f"✅ Found {len(all_emails)} unique email address(es)")
                             
                             # Display emails
                             st.subheader("📬 Extracted Emails")
-                            emails_df = pd.DataFrame({'Email': sorted(all_emails)})
+                            emails_df = pd.DataFrame({'Email': all_emails})
                             st.dataframe(emails_df, use_container_width=True)
                             
                             # Download button
@@ -140,9 +453,9 @@ CSV Data:
                             with col1:
                                 st.metric("Total Emails", len(all_emails))
                             with col2:
-                                st.metric("Unique Domains", len(set([email.split('@')[1] for email in all_emails if '@' in email])))
+                                st.metric("Unique Domains", len(domains))
                             with col3:
-                                st.metric("Source Rows", len(df))
+                                st.metric("Source Rows", row_count if row_count is not None else "—")
                         else:
                             st.warning("⚠️ No email addresses found in the CSV file")
                             st.session_state.extracted_emails = []
@@ -181,11 +494,11 @@ if st.session_state.extracted_emails:
             )
             
             delay_between_submissions = st.number_input(
-                "⏱️ Delay between submissions (seconds)",
+                "⏱️ Max wait per submission (seconds)",
                 min_value=1,
                 max_value=60,
                 value=3,
-                help="Wait time between each email submission"
+                help="Upper bound on the wait for each submission to complete; moves on as soon as the page reacts"
             )
         
         with col2:
@@ -202,6 +515,14 @@ if st.session_state.extracted_emails:
                 value=30,
                 help="Maximum time to wait for page elements"
             )
+            
+            num_workers = st.slider(
+                "🧵 Parallel browsers",
+                min_value=1,
+                max_value=8,
+                value=4,
+                help="Number of browser sessions submitting emails at the same time"
+            )
     
     # Custom Selectors (Target Session–first; leave empty to use defaults)
     with st.expander("🎯 Custom Element Selectors (Optional)", expanded=False):
@@ -224,71 +545,167 @@ if st.session_state.extracted_emails:
             )
     
     # Automation Functions
+    def selector_kind(selector):
+        """Classify a selector as 'xpath' (starts with //, .// or a paren) or 'css'"""
+        if selector.startswith('//') or selector.startswith('.//') or selector.startswith('('):
+            return 'xpath'
+        return 'css'
+    
+    def selector_locator(selector):
+        """Build a (By, selector) locator for WebDriverWait conditions"""
+        return (By.XPATH if selector_kind(selector) == 'xpath' else By.CSS_SELECTOR, selector)
+    
     def find_element_by_selectors(driver, selectors):
-        """Try multiple selectors to find an element (supports both CSS and XPath)"""
-        for selector in selectors:
-            if not selector:
-                continue
-            try:
-                # Try XPath first if it starts with // or .//
-                if selector.startswith('//') or selector.startswith('.//') or selector.startswith('('):
-                    try:
-                        element = driver.find_element(By.XPATH, selector)
-                        if element.is_displayed():
-                            return element, selector, 'xpath'
-                    except (NoSuchElementException, ElementNotInteractableException):
-                        pass
-                else:
-                    # Try CSS selector
-                    try:
-                        element = driver.find_element(By.CSS_SELECTOR, selector)
-                        if element.is_displayed():
-                            return element, selector, 'css'
-                    except (NoSuchElementException, ElementNotInteractableException):
-                        pass
-            except Exception:
-                continue
-        return None, None, None
+        """Try multiple selectors to find an element (supports both CSS and XPath).
+
+        All selectors are evaluated in the browser with a single script call
+        instead of one chromedriver round-trip per selector.
+        """
+        candidates = [[selector, selector_kind(selector)] for selector in selectors if selector]
+        if not candidates:
+            return None, None, None
+        try:
+            match = driver.execute_script(FIND_FIRST_VISIBLE_JS, candidates)
+        except Exception:
+            return None, None, None
+        if not match:
+            return None, None, None
+        index, element = match
+        selector, kind = candidates[index]
+        return element, selector, kind
 
     def find_element_by_selectors_with_wait(driver, selectors, timeout_seconds=15):
         """Wait for element to appear using any of the selectors (polls all selectors until one matches or timeout)."""
-        end_time = time.time() + timeout_seconds
-        while time.time() < end_time:
-            result = find_element_by_selectors(driver, selectors)
-            if result[0] is not None:
-                return result
-            time.sleep(0.5)
-        return None, None, None
-    
-    def is_driver_valid(driver):
-        """Check if the driver session is still valid"""
+        def first_match(d):
+            result = find_element_by_selectors(d, selectors)
+            return result if result[0] is not None else False
+        
         try:
-            if driver is None:
-                return False
-            # Try to get current URL to check if session is alive
-            driver.current_url
-            return True
-        except:
+            return WebDriverWait(driver, timeout_seconds, poll_frequency=0.25).until(first_match)
+        except TimeoutException:
+            return None, None, None
+    
+    def prefer_selector(selectors, preferred):
+        """Move a known-good selector to the front of the search order (only if it is still offered)"""
+        if preferred not in selectors:
+            return selectors
+        return (preferred, *(selector for selector in selectors if selector != preferred))
+    
+    @dataclass
+    class DriverHandle:
+        """A Chrome driver plus a locally tracked flag for whether its session is alive"""
+        driver: object = None
+        alive: bool = False
+        profile: str = None  # Reserved ProfilePool directory, released by close_driver
+    
+    class BrowserStartError(Exception):
+        """Chrome could not be started; the email being processed should be retried, not failed"""
+    
+    def is_driver_valid(handle):
+        """Check if the driver session is still valid (no browser round-trip)"""
+        return handle is not None and handle.alive and handle.driver is not None
+    
+    def probe_driver(handle):
+        """Confirm the session is alive with a real round-trip; use after a WebDriverException"""
+        if handle is None or handle.driver is None:
             return False
+        try:
+            handle.driver.current_url
+        except Exception:
+            handle.alive = False
+        return handle.alive
+    
+    def create_driver(timeout, headless, driver_path, profiles, profile_slot=0):
+        """Create a new Chrome driver instance wrapped in a live DriverHandle.
+
+        driver_path is the chromedriver binary, resolved once on the main thread
+        (see chromedriver_path) so worker threads never call into Streamlit.
+        The profile directory is reserved from profiles, preferring profile_slot;
+        if Chrome rejects a persistent profile (e.g. locked by another process),
+        one retry is made with a temporary profile. Raises BrowserStartError.
+        """
+        service = Service(driver_path)
+        for persistent in (True, False):
+            chrome_options = Options()
+            if headless:
+                chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            
+            # Only the form matters: skip images, notification prompts, GPU and extensions
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            
+            # Keep cookies/localStorage between runs so consent banners are dismissed only once
+            profile = profiles.acquire(profile_slot, persistent=persistent)
+            chrome_options.add_argument(f"--user-data-dir={profile}")
+            try:
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            except Exception as e:
+                profiles.release(profile)
+                error = e
+                continue
+            driver.set_page_load_timeout(timeout)
+            return DriverHandle(driver, alive=True, profile=profile)
+        raise BrowserStartError(str(error)) from error
+    
+    def close_driver(handle, profiles):
+        """Quit the handle's browser (if any) and give its profile back to the pool"""
+        if handle is None:
+            return
+        if handle.driver is not None:
+            try:
+                handle.driver.quit()
+            except Exception:
+                pass
+        handle.alive = False
+        if handle.profile:
+            profiles.release(handle.profile)
+            handle.profile = None
     
-    def create_driver(timeout, headless):
-        """Create a new Chrome driver instance"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+    def process_email_automation(email, url, email_selectors, submit_selectors, delay, timeout, headless, handle=None, is_first_email=False, form_selectors=None, selector_cache=None, driver_path=None, profiles=None, profile_slot=0):
+        """Process a single email through the automation workflow.
+
+        If the attempt fails on a form reused from the previous submission (e.g. its
+        button is now disabled or stale), the page is reloaded and the email retried
+        once before it is marked failed. Arguments and return value as submit_email.
+        """
+        log_entry, handle, next_form_selectors, reused_form = submit_email(
+            email, url, email_selectors, submit_selectors, delay, timeout, headless,
+            handle=handle, is_first_email=is_first_email, form_selectors=form_selectors,
+            selector_cache=selector_cache, driver_path=driver_path, profiles=profiles, profile_slot=profile_slot
+        )
+        if log_entry['status'] != 'failed' or not reused_form:
+            return log_entry, handle, next_form_selectors
         
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_page_load_timeout(timeout)
-        return driver
+        first_details = log_entry['details']
+        log_entry, handle, next_form_selectors, _ = submit_email(
+            email, url, email_selectors, submit_selectors, delay, timeout, headless,
+            handle=handle, is_first_email=True, form_selectors=None,
+            selector_cache=selector_cache, driver_path=driver_path, profiles=profiles, profile_slot=profile_slot
+        )
+        log_entry['details'] = first_details + ["↩️ Reused form failed, reloading the page and retrying"] + log_entry['details']
+        return log_entry, handle, next_form_selectors
     
-    def process_email_automation(email, url, email_selectors, submit_selectors, delay, timeout, headless, driver=None, is_first_email=False):
-        """Process a single email through the automation workflow"""
+    def submit_email(email, url, email_selectors, submit_selectors, delay, timeout, headless, handle=None, is_first_email=False, form_selectors=None, selector_cache=None, driver_path=None, profiles=None, profile_slot=0):
+        """Make one attempt at submitting an email.
+
+        Returns (log_entry, handle, form_selectors, reused_form); form_selectors is the
+        (email, submit) selector pair when the form is left ready for reuse, and
+        reused_form tells whether this attempt used such a form instead of loading the page.
+        selector_cache maps (url, email_selectors, submit_selectors) -> the (email, submit)
+        selectors that last worked, so changing a custom selector starts a fresh entry.
+        driver_path, profiles and profile_slot are used if a browser has to be (re)created.
+        If Chrome cannot be started the entry's status is 'retry': the email was not attempted.
+        """
         log_entry = {
             'email' : email,
             'status': 'processing',
@@ -296,73 +713,83 @@ if st.session_state.extracted_emails:
             'details': []
         }
         
-        driver_created_here = False
+        next_form_selectors = None
+        reused_form = False
+        
+        # Try the selectors that worked last time for this URL and selector set before the full list
+        cache_key = (url, tuple(email_selectors), tuple(submit_selectors))
+        cached_selectors = selector_cache.get(cache_key) if selector_cache is not None else None
+        if cached_selectors:
+            email_selectors = prefer_selector(email_selectors, cached_selectors[0])
+            submit_selectors = prefer_selector(submit_selectors, cached_selectors[1])
+        
         try:
             # Check if driver is valid, if not create a new one
-            if not is_driver_valid(driver):
+            if not is_driver_valid(handle):
+                # Release a dead session's browser (and its profile) before recreating
+                close_driver(handle, profiles)
                 log_entry['details'].append("🔄 Creating new browser session...")
-                driver = create_driver(timeout, headless)
-                driver_created_here = True
+                handle = create_driver(timeout, headless, driver_path, profiles, profile_slot)
                 log_entry['details'].append(f"✅ Browser initialized")
                 is_first_email = True  # Force navigation if driver was recreated
+            driver = handle.driver
             
-            # Navigate to URL (or refresh if not first email)
-            try:
-                if is_first_email:
+            # Reuse the form left on the page by the previous submission, if still there
+            email_element = None
+            if form_selectors and not is_first_email:
+                email_element, used_selector, selector_type = find_element_by_selectors(driver, (form_selectors[0],))
+                if email_element:
+                    reused_form = True
+                    log_entry['details'].append("♻️ Form still present, skipping page reload")
+            
+            if not email_element:
+                # Navigate to URL
+                try:
                     log_entry['details'].append(f"🌐 Navigating to: {url}")
                     driver.get(url)
-                else:
-                    log_entry['details'].append(f"🔄 Refreshing page...")
+                except Exception as e:
+                    log_entry['details'].append(f"⚠️ Navigation error: {str(e)}, attempting to recreate browser...")
+                    # If navigation fails, try recreating driver
+                    close_driver(handle, profiles)
+                    handle = create_driver(timeout, headless, driver_path, profiles, profile_slot)
+                    driver = handle.driver
+                    log_entry['details'].append("🔄 Recreated browser after navigation failure")
                     try:
-                        driver.refresh()
-                    except Exception as refresh_error:
-                        # If refresh fails, try navigating again
-                        log_entry['details'].append(f"⚠️ Refresh failed, navigating to URL instead: {str(refresh_error)}")
                         driver.get(url)
-            except Exception as e:
-                log_entry['details'].append(f"⚠️ Navigation error: {str(e)}, attempting to recreate browser...")
-                # If navigation fails, try recreating driver
-                try:
-                    if driver and is_driver_valid(driver):
-                        driver.quit()
-                except:
-                    pass
-                driver = create_driver(timeout, headless)
-                driver_created_here = True
-                log_entry['details'].append("🔄 Recreated browser after navigation failure")
+                    except Exception as nav_error:
+                        log_entry['status'] = 'failed'
+                        log_entry['details'].append(f"❌ Failed to navigate after recreation: {str(nav_error)}")
+                        return log_entry, handle, next_form_selectors, reused_form
+                
+                # Find email input field: wait until one is in the DOM instead of a fixed sleep
+                log_entry['details'].append("🔍 Searching for email input field...")
                 try:
-                    driver.get(url)
-                except Exception as nav_error:
-                    log_entry['status'] = 'failed'
-                    log_entry['details'].append(f"❌ Failed to navigate after recreation: {str(nav_error)}")
-                    return log_entry, driver
-            
-            time.sleep(2)  # Wait for page to load
-
-            # Find email input field (wait for dynamic content)
-            log_entry['details'].append("🔍 Searching for email input field...")
-            email_element, used_selector, selector_type = find_element_by_selectors_with_wait(
-                driver, email_selectors, timeout_seconds=min(15, timeout)
-            )
+                    WebDriverWait(driver, min(15, timeout)).until(EC.any_of(
+                        *(EC.presence_of_element_located(selector_locator(selector)) for selector in email_selectors if selector)
+                    ))
+                    email_element, used_selector, selector_type = find_element_by_selectors_with_wait(
+                        driver, email_selectors, timeout_seconds=min(15, timeout)
+                    )
+                except TimeoutException:
+                    pass  # No email field ever appeared
 
-            if not email_element:
-                log_entry['status'] = 'failed'
-                log_entry['details'].append("❌ Email input field not found with any selector")
-                return log_entry, driver
+                if not email_element:
+                    log_entry['status'] = 'failed'
+                    log_entry['details'].append("❌ Email input field not found with any selector")
+                    return log_entry, handle, next_form_selectors, reused_form
             
             log_entry['details'].append(f"✅ Found email field using {selector_type.upper()}: {used_selector}")
             
             # Clear and enter email
             try:
+                WebDriverWait(driver, min(10, timeout)).until(EC.element_to_be_clickable(email_element))
                 email_element.clear()
-                time.sleep(0.2)
                 email_element.send_keys(email)
                 log_entry['details'].append(f"✍️ Entered email: {email}")
-                time.sleep(0.5)
             except Exception as e:
                 log_entry['status'] = 'failed'
                 log_entry['details'].append(f"❌ Failed to enter email: {str(e)}")
-                return log_entry, driver
+                return log_entry, handle, next_form_selectors, reused_form
             
             # Find and click submit button (wait for dynamic content)
             log_entry['details'].append("🔍 Searching for submit button...")
@@ -375,45 +802,91 @@ if st.session_state.extracted_emails:
             if not submit_element:
                 log_entry['status'] = 'failed'
                 log_entry['details'].append("❌ Submit button not found with any selector")
-                return log_entry, driver
+                return log_entry, handle, next_form_selectors, reused_form
             
             log_entry['details'].append(f"✅ Found submit button using {submit_selector_type.upper()}: {used_submit_selector}")
             
             # Scroll to element and click
             try:
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_element)
-                time.sleep(0.5)
-                submit_element.click()
+                WebDriverWait(driver, min(10, timeout)).until(EC.element_to_be_clickable(submit_element))
+                page_url = driver.current_url
+                try:
+                    # Scroll and click in a single round-trip
+                    driver.execute_script(
+                        "arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", submit_element
+                    )
+                except WebDriverException:
+                    # Fall back to a native pointer click for pages that reject script clicks
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_element)
+                    time.sleep(0.5)
+                    submit_element.click()
                 log_entry['details'].append("🖱️ Clicked submit button")
             except Exception as e:
                 log_entry['status'] = 'failed'
                 log_entry['details'].append(f"❌ Failed to click submit button: {str(e)}")
-                return log_entry, driver
+                return log_entry, handle, next_form_selectors, reused_form
             
-            # Wait for submission to complete
-            time.sleep(delay)
-            log_entry['details'].append(f"⏳ Waited {delay} seconds for submission")
+            # Wait for submission to complete: the button goes stale or the URL changes.
+            # The configured delay is an upper bound, not a fixed sleep.
+            wait_started = time.time()
+            try:
+                WebDriverWait(driver, delay).until(EC.any_of(
+                    EC.staleness_of(submit_element), EC.url_changes(page_url)
+                ))
+                log_entry['details'].append(f"⏳ Submission settled after {time.time() - wait_started:.1f} seconds")
+            except TimeoutException:
+                log_entry['details'].append(f"⏳ Waited {delay} seconds for submission")
             
             log_entry['status'] = 'success'
             log_entry['details'].append("✅ Submission completed successfully")
+            if selector_cache is not None:
+                selector_cache[cache_key] = (used_selector, used_submit_selector)
             
+            # Leave the form ready for the next email instead of reloading the page
+            try:
+                driver.execute_script("arguments[0].value = '';", email_element)
+                next_submit = find_element_by_selectors(driver, (used_submit_selector,))[0]
+                if next_submit and next_submit.is_enabled():
+                    next_form_selectors = (used_selector, used_submit_selector)
+            except Exception:
+                pass  # Form went away (e.g. redirect); next email navigates again
+            
+        except BrowserStartError as e:
+            log_entry['status'] = 'retry'
+            log_entry['details'].append(f"⚠️ Could not start browser: {str(e)}")
         except TimeoutException as e:
             log_entry['status'] = 'failed'
             log_entry['details'].append(f"❌ Timeout: Page took too long to load - {str(e)}")
             # Don't close driver on timeout, let it be reused
+        except InvalidSessionIdException as e:
+            log_entry['status'] = 'failed'
+            log_entry['details'].append(f"❌ Browser session lost: {str(e)}")
+            handle.alive = False  # Signal that driver needs to be recreated
+        except WebDriverException as e:
+            log_entry['status'] = 'failed'
+            log_entry['details'].append(f"❌ Error: {str(e)}")
+            # Only now pay for a round-trip to find out whether the session survived
+            if not probe_driver(handle):
+                log_entry['details'].append("⚠️ Browser session lost, it will be recreated")
         except Exception as e:
             log_entry['status'] = 'failed'
             log_entry['details'].append(f"❌ Error: {str(e)}")
-            # If driver was created here and there's an error, we might need to recreate it
-            if driver_created_here:
-                try:
-                    if not is_driver_valid(driver):
-                        driver = None  # Signal that driver needs to be recreated
-                except:
-                    driver = None
         
         # Never close the driver here - let the calling function manage it
-        return log_entry, driver
+        return log_entry, handle, next_form_selectors, reused_form
+    
+    def format_log(log_entry, number):
+        """Render one log entry as markdown for the live log placeholder"""
+        status = "✅ Success" if log_entry['status'] == 'success' else "❌ Failed"
+        details = "\n".join(f"- {detail}" for detail in log_entry['details'])
+        return f"**Email {number}: {log_entry['email']}** — {status}\n\n{details}"
+    
+    def read_logs(path):
+        """Load every entry of a JSONL automation log (empty if there is none yet)"""
+        if not path or not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
     
     def run_automation():
         """Run automation for all emails"""
@@ -426,94 +899,156 @@ if st.session_state.extracted_emails:
             return
         
         st.session_state.automation_running = True
-        st.session_state.automation_logs = []
         
-        # Target-first: Target Session has placeholder="Your email", NO name. Right Now has name="email".
-        # Never use input[name*="email"] or input[id*="email"] early—they match Right Now first.
-        default_email_selectors = [
-            "//input[@type='email' and @placeholder='Your email']",   # Target Session
-            "//input[@placeholder='Your email' and @type='email']",
-            'input[type="email"][placeholder="Your email"]',
-            "//form[.//input[@placeholder='Your email']]//input[@type='email']",  # scoped by form
-            "//input[@type='email' and not(@name)]",   # fallback: Target has no name
-            "//input[@type='email']",                 # last resort
-        ]
-
-        default_submit_selectors = [
-            "//button[@aria-label='submit' and .//p[normalize-space()='Sign up']]",  # Target Session
-            "//button[@aria-label='submit' and contains(., 'Sign up')]",
-            "//form[.//input[@placeholder='Your email']]//button[contains(., 'Sign up')]",  # scoped by form
-            "//button[contains(text(), 'Sign up')]",
-            "//button[@type='submit']",
-        ]
-
+        email_selectors = (custom_email_selector, *DEFAULT_EMAIL_SELECTORS) if custom_email_selector else DEFAULT_EMAIL_SELECTORS
+        submit_selectors = (custom_submit_selector, *DEFAULT_SUBMIT_SELECTORS) if custom_submit_selector else DEFAULT_SUBMIT_SELECTORS
         
-        email_selectors = [custom_email_selector] + default_email_selectors if custom_email_selector else default_email_selectors
-        submit_selectors = [custom_submit_selector] + default_submit_selectors if custom_submit_selector else default_submit_selectors
+        # Resolve chromedriver here, on the main thread: workers get the path as an argument,
+        # so they neither race to install it nor call into the Streamlit cache
+        try:
+            driver_path = chromedriver_path()
+        except Exception as e:
+            st.error(f"❌ Failed to set up ChromeDriver: {str(e)}")
+            st.session_state.automation_running = False
+            return
         
-        # Process each email
+        # The full log is appended to disk; session state only keeps its path.
+        # The id suffix keeps concurrent sessions (or runs in the same second) apart.
+        log_file, log_path = open_run_log()
+        if log_file is None:
+            # A missing log shouldn't block the run itself
+            st.warning("⚠️ Could not create an automation log file; running without one, so no history will be saved.")
+        st.session_state.automation_log_path = log_path
+        
+        # Process emails in parallel, each worker owning its own browser
         progress_bar = st.progress(0)
         status_text = st.empty()
-        log_container = st.container()
+        live_log = st.empty()  # Latest entry only, replaced in place
         
-        total_emails = len(st.session_state.extracted_emails)
+        emails = list(st.session_state.extracted_emails)
+        # Shared with the workers; a single dict assignment is atomic, so no lock needed
+        selector_cache = st.session_state.selector_cache
+        total_emails = len(emails)
+        worker_count = min(num_workers, total_emails)
         success_count = 0
         failed_count = 0
-        driver = None
+        
+        email_queue = queue.Queue()
+        for email in emails:
+            email_queue.put(email)
+        
+        # Workers never touch Streamlit: they append here and the main thread renders
+        results = []
+        results_lock = threading.Lock()
+        start_errors = []
+        stop_event = threading.Event()
+        profiles = profile_pool()
+        
+        def worker(slot):
+            """Submit queued emails with a dedicated browser until the queue is empty"""
+            handle = None
+            form_selectors = None
+            is_first = True
+            start_failures = 0
+            try:
+                while not stop_event.is_set():
+                    try:
+                        email = email_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    # Process email and get updated driver
+                    log_entry, handle, form_selectors = process_email_automation(
+                        email, target_url, email_selectors, submit_selectors,
+                        delay_between_submissions, timeout_seconds, headless_mode,
+                        handle=handle, is_first_email=(is_first or not is_driver_valid(handle)),
+                        form_selectors=form_selectors, selector_cache=selector_cache,
+                        driver_path=driver_path, profiles=profiles, profile_slot=slot
+                    )
+                    
+                    # A browser that won't start doesn't use up the email: put it back for
+                    # another attempt (or another worker) and give up after a few tries
+                    if log_entry['status'] == 'retry':
+                        email_queue.put(email)
+                        start_failures += 1
+                        if start_failures >= BROWSER_START_ATTEMPTS:
+                            with results_lock:
+                                start_errors.append(log_entry['details'][-1])
+                            break
+                        time.sleep(1)
+                        continue
+                    start_failures = 0
+                    is_first = False
+                    
+                    with results_lock:
+                        results.append(log_entry)
+            finally:
+                # Close this worker's browser and release its profile
+                close_driver(handle, profiles)
+        
+        executor = ThreadPoolExecutor(max_workers=worker_count)
+        futures = [executor.submit(worker, slot) for slot in range(worker_count)]
+        rendered = 0
         
         try:
-            for idx, email in enumerate(st.session_state.extracted_emails):
+            while True:
                 if not st.session_state.automation_running:
-                    break
-                
-                status_text.text(f"Processing {idx + 1}/{total_emails}: {email}")
-                progress_bar.progress((idx + 1) / total_emails)
-                
-                is_first = (idx == 0 or driver is None)
-                
-                # Process email and get updated driver
-                log_entry, driver = process_email_automation(
-                    email, target_url, email_selectors, submit_selectors,
-                    delay_between_submissions, timeout_seconds, headless_mode,
-                    driver=driver, is_first_email=is_first
-                )
+                    stop_event.set()
                 
-                st.session_state.automation_logs.append(log_entry)
+                _, pending = wait(futures, timeout=0.5)
+                with results_lock:
+                    new_entries = results[:]
+                    results.clear()
                 
-                if log_entry['status'] == 'success':
-                    success_count += 1
-                else:
-                    failed_count += 1
-                
-                # Display logs in real-time
-                with log_container:
-                    st.markdown(f"**Email {idx + 1}: {email}**")
+                for log_entry in new_entries:
+                    rendered += 1
+                    if log_file:
+                        log_file.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+                    
                     if log_entry['status'] == 'success':
-                        st.success("✅ Success")
+                        success_count += 1
                     else:
-                        st.error("❌ Failed")
-                    for detail in log_entry['details']:
-                        st.text(f"  {detail}")
-                    st.markdown("---")
+                        failed_count += 1
+                
+                # Display the latest log in real-time
+                if new_entries:
+                    if log_file:
+                        log_file.flush()
+                    status_text.text(f"Processed {rendered}/{total_emails}: {new_entries[-1]['email']}")
+                    progress_bar.progress(rendered / total_emails)
+                    live_log.markdown(format_log(new_entries[-1], rendered))
                 
-                # Small delay between emails to ensure page is ready
-                if idx < total_emails - 1:  # Don't wait after last email
-                    time.sleep(1)
+                if not pending:
+                    break
+            
+            # Surface any exception raised inside a worker
+            for future in futures:
+                future.result()
+            
+            unprocessed = email_queue.qsize()
+            if start_errors and unprocessed:
+                st.error(f"❌ {unprocessed} email(s) were not processed because the browser could not start: {start_errors[-1]}")
+            st.info(f"🔒 Closed {worker_count} browser(s) after processing all emails")
                     
         except Exception as e:
             st.error(f"❌ Fatal error in automation loop: {str(e)}")
         finally:
-            # Close browser if still open (only at the very end)
-            if driver and is_driver_valid(driver):
-                try:
-                    driver.quit()
-                    st.info("🔒 Browser closed after processing all emails")
-                except Exception as e:
-                    pass
+            # Stop workers (also on a Streamlit rerun); each one closes its own browser
+            stop_event.set()
+            executor.shutdown(wait=False)
+            if log_file:
+                log_file.close()
         
         st.session_state.automation_running = False
         progress_bar.empty()
         
+        # Full history rendered once at the end instead of growing the page per email
+        history_logs = read_logs(log_path)
+        if history_logs:
+            history = pd.DataFrame(history_logs)
+            history['details'] = history['details'].str.join('\n')
+            st.dataframe(history, use_container_width=True)
+        
         # Final summary
         st.success(f"✅ Automation completed!")
         col1, col2, col3 = st.columns(3)
@@ -539,9 +1074,11 @@ if st.session_state.extracted_emails:
     
     with col3:
         if st.button("📋 View Logs"):
-            if st.session_state.automation_logs:
+            # Read from disk on demand; session state only holds the log path
+            logs = read_logs(st.session_state.automation_log_path)
+            if logs:
                 st.subheader("📋 Automation Logs")
-                for log in st.session_state.automation_logs:
+                for log in logs:
                     with st.expander(f"{log['email']} - {log['status'].upper()}", expanded=False):
                         st.text(f"Timestamp: {log['timestamp']}")
                         for detail in log['details']: